@@ -28,15 +28,21 @@ def fill_segments(mask, objects):
     params.device += 1
 
     h,w = mask.shape
-    markers = np.zeros((h,w))
+    markers = np.zeros((h,w), dtype=np.int32)
 
     labels = np.arange(len(objects)) + 1
-    for i,l in enumerate(labels):
-        cv2.drawContours(markers, objects, i ,int(l) , 5)
+    # Pass one contour per call so OpenCV does not convert the full list each time
+    for obj, l in zip(objects, labels):
+        cv2.drawContours(markers, [obj], -1, int(l), 5)
 
-    # Fill as a watershed segmentation from contours as markers
-    filled_mask = watershed(mask==0, markers=markers,
-                            mask=mask!=0,compactness=0)
+    obj_mask = mask.astype(bool, copy=False)
+    if np.all(markers[obj_mask]):
+        # Markers already label every object pixel, nothing left to flood
+        filled_mask = np.where(obj_mask, markers, 0)
+    else:
+        # Fill as a watershed segmentation from contours as markers
+        filled_mask = watershed(~obj_mask, markers=markers,
+                                mask=obj_mask,compactness=0)
 
     # Count area in pixels of each segment
     ids, counts = np.unique(filled_mask, return_counts=True)
@@ -46,11 +52,11 @@ def fill_segments(mask, objects):
                             value=counts[1:].tolist(),
                             label=(ids[1:]-1).tolist())
 
+    # Color each segment with a single palette lookup (label 0 is background)
     rgb_vals = color_palette(num=len(labels), saved=True)
-    filled_img = np.zeros((h,w,3), dtype=np.uint8)
-    for l in labels:
-        for ch in range(3):
-            filled_img[:,:,ch][filled_mask==l] = rgb_vals[l-1][ch]
+    palette = np.zeros((len(labels) + 1, 3), dtype=np.uint8)
+    palette[1:] = np.asarray(rgb_vals[:len(labels)], dtype=np.uint8)
+    filled_img = palette[filled_mask]
 
     if params.debug == 'print':
         print_image(filled_img, os.path.join(params.debug_outdir, str(params.device) + '_filled_img.png'))